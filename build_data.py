@@ -0,0 +1,46 @@
+"""Merges the two source JSON files into one prebuilt data file.
+
+Startup normally opens and parses LiFanwenTangutList.json and
+TangutCompoundWordsProposed.json separately; running this script once
+produces a single tangut_data.msgpack (or tangut_data.json when msgpack
+is not installed) that load_tangut_data then reads in a single
+open/parse pass instead.
+"""
+import json
+import sys
+
+# Optional compact binary format; parses several times faster than JSON
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+LIFANWEN_FILE = 'LiFanwenTangutList.json'
+COMPOUND_FILE = 'TangutCompoundWordsProposed.json'
+
+
+def main():
+    try:
+        with open(LIFANWEN_FILE, 'rb') as f:
+            lifanwen = json.load(f)
+        with open(COMPOUND_FILE, 'rb') as f:
+            compound = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Error: could not read source data: {e}")
+        sys.exit(1)
+
+    merged = {'lifanwen': lifanwen, 'compound': compound}
+    if msgpack is not None:
+        out_path = 'tangut_data.msgpack'
+        with open(out_path, 'wb') as f:
+            msgpack.pack(merged, f)
+    else:
+        out_path = 'tangut_data.json'
+        with open(out_path, 'w', encoding='utf-8') as f:
+            json.dump(merged, f, ensure_ascii=False)
+
+    print(f"Wrote {len(lifanwen)} Li Fanwen entries and {len(compound)} compound entries to '{out_path}'.")
+
+
+if __name__ == "__main__":
+    main()
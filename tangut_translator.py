@@ -1,301 +1,954 @@
+import io
 import re
 import os
 import json
 import sys
+import mmap
+import pickle
+import string
+from collections import defaultdict, namedtuple
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property, lru_cache
+
+# Optional streaming JSON parser: when ijson is installed, entries are parsed
+# one at a time instead of materializing the whole array up front. Prefer the
+# C-backed yajl2 backend when it is available.
+try:
+    import ijson
+    try:
+        from ijson.backends import yajl2_c as _ijson_backend
+    except ImportError:
+        _ijson_backend = ijson
+    _JSON_STREAM_ERROR = ijson.JSONError
+except ImportError:
+    _ijson_backend = None
+    _JSON_STREAM_ERROR = ValueError  # streaming never runs without ijson
+
+# Optional fast JSON parser for the non-streaming path; returns the same
+# Python types as the stdlib json module.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Optional compact binary format for the merged data file build_data.py writes
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# Optional C-implemented Aho-Corasick automaton (pyahocorasick) for the
+# Tangut longest-match scans; the pure-Python scan remains the fallback.
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
 
 # --- Constants for Unicode Ranges ---
-TANGUT_CHAR_REGEX = r'[\U00017000-\U000187FF]+'
+# Bounds of the Tangut Unicode block, for codepoint-indexed lookup tables
+_TANGUT_BASE = 0x17000
+_TANGUT_BLOCK_SIZE = 0x1800
 CHINESE_CHAR_REGEX = r'[\u4e00-\u9fff]+' # Common Chinese characters
 
+
+def _is_tangut(c):
+    """True when c lies in the Tangut Unicode block (U+17000-U+187FF);
+    a single integer compare, no regex machinery needed."""
+    return _TANGUT_BASE <= ord(c) < _TANGUT_BASE + _TANGUT_BLOCK_SIZE
+
+# Miss sentinel for the hot lookup loops: `x is not _MISS` is a pointer
+# compare, skipping the __bool__-style truthiness test a plain
+# `dict.get(...)` result would need. Also the empty-slot filler in the
+# codepoint-indexed character tables.
+_MISS = object()
+
+# Compiled once at module scope: punctuation stripping runs in the hot loops
+# of both dictionary loading and English input normalization.
+_PUNCT_RE = re.compile(r'[^\w\s]')
+
+# Deletion table for ASCII punctuation, minus underscore which \w retains;
+# str.translate with it is a single C-level pass, much cheaper than the regex
+_PUNCT_TABLE = str.maketrans('', '', string.punctuation.replace('_', ''))
+
+@lru_cache(maxsize=65536)
+def _normalize(s):
+    """
+    Lowercases s and strips punctuation: via the translate table for the
+    common all-ASCII case, falling back to the [^\\w\\s] regex for non-ASCII
+    input that may carry other non-word characters. Memoized: meaning
+    strings repeat heavily across entries during index building.
+    """
+    if s.isascii():
+        return s.translate(_PUNCT_TABLE).lower()
+    return _PUNCT_RE.sub('', s).lower()
+
+# Modern Concept parser, compiled once: a single pass captures the optional
+# leading Chinese run, the text before any parenthesis, and the content of
+# the first (closed) parenthesized chunk
+_CONCEPT_RE = re.compile(rf"^(?:({CHINESE_CHAR_REGEX})\s*)?([^(]*)(?:\(([^)]*)\))?")
+
+# One english_to_tangut posting. A namedtuple is a fraction of the size of the
+# 3-key dict it replaces and is hashable, which the insert-time dedup relies on.
+Posting = namedtuple('Posting', ['char', 'phonetics', 'original_meaning'])
+
+
+def _clean(s):
+    """
+    Strips surrounding whitespace only when some is actually present;
+    str.strip() always allocates a copy, even for already-clean JSON fields.
+    """
+    return s.strip() if s and (s[0].isspace() or s[-1].isspace()) else s
+
+
+def _stream_json_items(f):
+    """Yields entries of a JSON array from an open binary file via ijson.
+
+    Parse errors propagate to whoever materializes the stream: a corrupt or
+    truncated file must abort the whole load, not quietly truncate it to
+    the prefix that parsed.
+    """
+    with f:
+        yield from _ijson_backend.items(f, 'item')
+
+
 def load_json_data(file_path):
-    """Loads JSON data from a specified file path."""
+    """Returns an iterator over the entries of a JSON array file, or None on error.
+
+    When ijson is available the file is stream-parsed, so entries are yielded
+    one at a time and the raw array is never held in memory; otherwise the
+    whole file is parsed at once with the stdlib json module.
+    """
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        f = open(file_path, 'rb')
     except FileNotFoundError:
         print(f"Error: JSON file '{file_path}' not found. Please ensure it's in the same directory.")
         return None
-    except json.JSONDecodeError:
-        print(f"Error: Could not decode JSON from '{file_path}'. Please check file format.")
-        return None
     except Exception as e:
         print(f"An unexpected error occurred while loading data from '{file_path}': {e}")
         return None
 
-def load_tangut_data(lifanwen_file_path, compound_file_path):
-    """
-    Loads Tangut vocabulary data from two JSON files and builds translation dictionaries
-    for English, Tangut, and Chinese, including compound word lookups.
-    """
-    # {Tangut_char/compound_string: {'phonetics': '...', 'meanings': [...], 'chinese_char': '...'}}
-    tangut_phrases_to_meanings = {}
+    if _ijson_backend is not None:
+        return _stream_json_items(f)
 
-    # {english_word_lower: [{'char': '𘞗', 'phonetics': 'sjwɨ1', 'original_meaning': 'seed'}], ...}
-    english_to_tangut = {}
+    try:
+        with f:
+            if orjson is not None:
+                # Feed orjson the file pages directly: no intermediate
+                # read() copy into a Python bytes object, and the kernel
+                # pages the file in on demand. orjson takes a memoryview
+                # but not a raw mmap; release it before the map closes.
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    view = memoryview(mm)
+                    try:
+                        return iter(orjson.loads(view))
+                    finally:
+                        view.release()
+            return iter(json.load(f))
+    except ValueError:  # covers json.JSONDecodeError and orjson.JSONDecodeError
+        print(f"Error: Could not decode JSON from '{file_path}'. Please check file format.")
+        return None
+    except Exception as e:
+        print(f"An unexpected error occurred while loading data from '{file_path}': {e}")
+        return None
 
-    # {Tangut_char/compound_string: 'Chinese_char', ...} (for all direct Tangut->Chinese mappings)
-    tangut_to_chinese = {}
+def _load_json_entries(file_path):
+    """Loads a JSON array file eagerly into a list, or returns None on error.
 
-    # {Chinese_char: [Tangut_char1, Tangut_char2], ...} (for all Chinese->Tangut mappings)
-    chinese_to_tangut = {}
+    Wraps load_json_data for callers that need the whole entry list anyway:
+    materializing here keeps the parse work on the calling thread and is
+    also where a malformed file surfaces on the ijson path, since the
+    stream only reports decode errors as it is consumed.
+    """
+    data = load_json_data(file_path)
+    if data is None:
+        return None
+    try:
+        return list(data)
+    except _JSON_STREAM_ERROR:
+        print(f"Error: Could not decode JSON from '{file_path}'. Please check file format.")
+        return None
 
-    # For tracking warnings
-    total_li_fanwen_entries = 0
-    total_compound_entries = 0
-    total_entries_with_missing_phonetics = 0
+def _build_automaton(mapping):
+    """
+    Builds an Aho-Corasick automaton over the keys of mapping, with (key,
+    value) payloads, or returns None when pyahocorasick is unavailable.
+    iter_long() on the result walks an input in one C-level pass, yielding
+    leftmost-longest matches — the same segmentation the Python scan produces.
+    """
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for key, value in mapping.items():
+        automaton.add_word(key, (key, value))
+    automaton.make_automaton()
+    return automaton
 
-    # Helper function to add mappings to english_to_tangut
-    def add_to_english_map(key_phrase, tangut_char_display, phonetics_info, original_meaning_for_context):
-        if not key_phrase: return
 
-        # Normalize the phrase: remove punctuation, lowercase
-        normalized_key_phrase = re.sub(r'[^\w\s]', '', key_phrase).lower()
-        if not normalized_key_phrase: return
+def _build_scan_regex(keys):
+    """
+    Compiles one alternation over all keys, longest first, with a final '.'
+    arm that catches any single unknown character. Alternation tries arms in
+    listed order, so the longest key starting at a position always wins —
+    the same segmentation as the Python longest-match scan — but finditer
+    walks the whole input inside the C regex engine.
+
+    Measured against the per-first-char lengths scan on this dataset the
+    alternation is considerably slower (re backtracks through the ~6k arms
+    per position rather than compiling a DFA), so main() does not use it;
+    it remains available for callers that only have the dict.
+    """
+    pattern = '|'.join(map(re.escape, sorted(keys, key=len, reverse=True)))
+    return re.compile(pattern + '|.', re.DOTALL)
 
-        entry = {
-            'char': tangut_char_display, # This can be a single char or a compound string
-            'phonetics': phonetics_info,
-            'original_meaning': original_meaning_for_context
-        }
 
-        # Add the full normalized phrase as a lookup key
-        english_to_tangut.setdefault(normalized_key_phrase, []).append(entry)
+def _first_char_lengths(keys):
+    """
+    Maps each distinct first character of keys to a descending-sorted tuple
+    of the distinct key lengths starting with it. The longest-match scans use
+    this to probe only lengths that can actually match at a position — for
+    most characters that is a single length, or nothing at all.
+    """
+    by_first = defaultdict(set)
+    for key in keys:
+        by_first[key[0]].add(len(key))
+    return {first: tuple(sorted(lengths, reverse=True))
+            for first, lengths in by_first.items()}
 
-        # Add individual words from the phrase as lookup keys
-        words_in_phrase = normalized_key_phrase.split()
-        for word in words_in_phrase:
-            if word:
-                english_to_tangut.setdefault(word, []).append(entry)
 
-    # --- 1. Load LiFanwenTangutList.json ---
-    li_fanwen_data = load_json_data(lifanwen_file_path)
-    if li_fanwen_data:
-        total_li_fanwen_entries = len(li_fanwen_data)
-        for entry in li_fanwen_data:
-            char = entry.get("Character", "").strip()
-            meaning_phrase = entry.get("Meaning", "").strip()
-            keyword_phrase = entry.get("Keyword", "").strip()
-            phonetics = entry.get("Phonetics", "").strip()
-            chinese_char = entry.get("Chinese Character", "").strip()
+# Base name of the prebuilt merged data file produced by build_data.py
+_MERGED_BASENAME = 'tangut_data'
 
-            if not char:
-                continue
 
-            phonetics_to_store = phonetics
-            if not phonetics:
-                total_entries_with_missing_phonetics += 1
-                phonetics_to_store = "<?MISSING_PHONETICS?>"
+def _load_merged_entries(lifanwen_file_path, compound_file_path):
+    """
+    Returns (li_fanwen_entries, compound_entries) from a prebuilt merged data
+    file (see build_data.py) sitting beside the sources, or None when no
+    up-to-date merge exists. One open/parse pass replaces the two per-file
+    round trips.
+    """
+    directory = os.path.dirname(lifanwen_file_path)
+    try:
+        newest_source = max(os.path.getmtime(lifanwen_file_path),
+                            os.path.getmtime(compound_file_path))
+    except OSError:
+        return None  # missing source file; the normal load path reports it
+
+    candidates = []
+    if msgpack is not None:
+        candidates.append((os.path.join(directory, _MERGED_BASENAME + '.msgpack'), True))
+    candidates.append((os.path.join(directory, _MERGED_BASENAME + '.json'), False))
+
+    for path, is_msgpack in candidates:
+        try:
+            if os.path.getmtime(path) < newest_source:
+                continue  # stale merge; fall back to the source files
+            with open(path, 'rb') as f:
+                if is_msgpack:
+                    merged = msgpack.unpack(f)
+                elif orjson is not None:
+                    merged = orjson.loads(f.read())
+                else:
+                    merged = json.load(f)
+        except OSError:
+            continue  # no merged file of this flavor
+        except Exception as e:
+            print(f"Note: could not read merged data '{path}' ({e}); loading the source files instead.")
+            continue
+        print(f"\nLoaded merged translation data from '{path}'.")
+        return merged['lifanwen'], merged['compound']
+    return None
+
+
+def _compact_trie(node):
+    """
+    Compacts a token trie into a radix tree: unary non-terminal chains are
+    merged so each edge carries a tuple of tokens instead of one dict per
+    token. Edges become {first_token: (label_tuple, child_node)}; the '$'
+    terminal key is kept as-is.
+    """
+    compacted = {}
+    if '$' in node:
+        compacted['$'] = node['$']
+    for token, child in node.items():
+        if token == '$':
+            continue
+        label = [token]
+        # Follow chains of single-child nodes with no terminal
+        while '$' not in child and len(child) == 1:
+            (next_token, next_child), = child.items()
+            label.append(next_token)
+            child = next_child
+        compacted[label[0]] = (tuple(label), _compact_trie(child))
+    return compacted
+
+
+class TangutData:
+    """
+    All translation structures, built lazily from the raw JSON entry lists.
+
+    Each direction's maps are cached properties, so a session that only ever
+    translates Tangut->Chinese never pays for the per-word English index, and
+    startup is just the raw JSON parse. Two build passes back the public
+    attributes: _tangut_maps (char data plus both Chinese maps, one pass over
+    the entries) and _english_index (the posting-list index and its radix
+    tree). A plain class rather than a slotted dataclass: cached_property
+    stores its results in the instance __dict__, which slots would remove.
+    """
 
-            # Populate tangut_phrases_to_meanings (for single characters)
-            if char:
-                meanings_list = []
-                if meaning_phrase and meaning_phrase != '?':
-                    meanings_list.append(meaning_phrase)
-                if keyword_phrase and keyword_phrase != '?':
-                    if keyword_phrase not in meanings_list: # Avoid duplicate meanings
-                        meanings_list.append(keyword_phrase)
-                tangut_phrases_to_meanings[char] = {
-                    'phonetics': phonetics_to_store,
-                    'meanings': meanings_list
-                }
-
-                # Populate english_to_tangut from Li Fanwen meanings
-                if meaning_phrase and meaning_phrase != '?':
-                    add_to_english_map(meaning_phrase, char, phonetics_to_store, meaning_phrase)
-                if keyword_phrase and keyword_phrase != '?':
-                    add_to_english_map(keyword_phrase, char, phonetics_to_store, meaning_phrase if meaning_phrase else keyword_phrase)
-
-                # Populate Chinese mappings (Tangut <-> Chinese, for single characters)
-                if chinese_char:
-                    tangut_to_chinese[char] = chinese_char
-                    chinese_to_tangut.setdefault(chinese_char, []).append(char)
-
-    # --- 2. Load TangutCompoundWordsProposed.json ---
-    compound_data = load_json_data(compound_file_path)
-    if compound_data:
-        total_compound_entries = len(compound_data)
-        for entry in compound_data:
-            modern_concept = entry.get("Modern Concept", "").strip()
-            proposed_tangut_word_raw = entry.get("Proposed Tangut Word", "").strip() # E.g., "𗠾𗴾 (tsụ2wej2)"
-            literal_tangut_meaning = entry.get("Literal Tangut Meaning", "").strip()
+    def __init__(self, li_fanwen_entries, compound_entries, cache_path=None, source_sig=None):
+        self._li_fanwen_entries = li_fanwen_entries
+        self._compound_entries = compound_entries
+        self._cache_path = cache_path
+        self._source_sig = source_sig
+        self._cache_written = False
+
+    @classmethod
+    def from_cache(cls, snapshot):
+        """Rebuilds a bundle from a pickled {build-pass name: result} snapshot."""
+        data = cls(None, None)
+        data._cache_written = True  # the cache is already up to date
+        # The instance __dict__ is exactly where cached_property would store
+        # these results, so the builders never run on a cache hit.
+        data.__dict__.update(snapshot)
+        return data
+
+    def _write_cache_if_complete(self, tangut_maps=None, english_index=None):
+        """
+        Called by each build pass with its own result; writes the pickle cache
+        once both passes have run. The caller passes its result explicitly
+        because cached_property has not stored it in __dict__ yet at that point.
+        """
+        if self._cache_path is None or self._source_sig is None or self._cache_written:
+            return
+        tangut_maps = tangut_maps or self.__dict__.get('_tangut_maps')
+        english_index = english_index or self.__dict__.get('_english_index')
+        if tangut_maps is None or english_index is None:
+            return
+        try:
+            with open(self._cache_path, 'wb') as f:
+                pickle.dump((self._source_sig,
+                             {'_tangut_maps': tangut_maps, '_english_index': english_index}),
+                            f, protocol=5)
+            self._cache_written = True
+        except Exception as e:
+            print(f"Note: could not write cache '{self._cache_path}': {e}")
+
+    @cached_property
+    def _parsed_compounds(self):
+        """
+        Compound entries parsed into (tangut_chars, phonetics, english_part,
+        chinese_part, literal_meaning) tuples, shared by both build passes.
+        """
+        parsed = []
+        for entry in self._compound_entries:
+            modern_concept = _clean(entry.get("Modern Concept", ""))
+            proposed_tangut_word_raw = _clean(entry.get("Proposed Tangut Word", "")) # E.g., "𗠾𗴾 (tsụ2wej2)"
+            literal_tangut_meaning = _clean(entry.get("Literal Tangut Meaning", ""))
 
             if not proposed_tangut_word_raw:
                 continue
 
-            # Extract actual Tangut character(s) and phonetics from the raw string
-            match = re.match(rf"({TANGUT_CHAR_REGEX}+)(?: \(([^)]+)\))?", proposed_tangut_word_raw)
-            if match:
-                tangut_char_for_map = match.group(1).strip() # This could be one or multiple chars
-                phonetics_for_map = match.group(2).strip() if match.group(2) else "<?COMPOUND_PHONETICS_N/A?>"
+            # Extract actual Tangut character(s) and phonetics from the raw
+            # string. The well-formed shape is "chars (phonetics)", so two
+            # C-level find checks and slices replace a regex invocation per entry.
+            paren_idx = proposed_tangut_word_raw.find(' (')
+            close_idx = proposed_tangut_word_raw.find(')', paren_idx) if paren_idx >= 0 else -1
+            if paren_idx >= 0 and close_idx >= 0:
+                tangut_char_for_map = proposed_tangut_word_raw[:paren_idx].strip() # This could be one or multiple chars
+                phonetics_for_map = proposed_tangut_word_raw[paren_idx + 2:close_idx].strip() or "<?COMPOUND_PHONETICS_N/A?>"
+                # Sanity-check that the leading token really is Tangut; if
+                # not, treat the entry as unexpected-format below
+                if not all(_is_tangut(c) for c in tangut_char_for_map):
+                    tangut_char_for_map = proposed_tangut_word_raw
+                    phonetics_for_map = "<?COMPOUND_PHONETICS_N/A?>"
             else:
                 tangut_char_for_map = proposed_tangut_word_raw # Fallback if format is unexpected
                 phonetics_for_map = "<?COMPOUND_PHONETICS_N/A?>"
 
-            # Parse Modern Concept for both English and Chinese parts
+            tangut_char_for_map = sys.intern(tangut_char_for_map)
+            phonetics_for_map = sys.intern(phonetics_for_map)
+
+            # Parse Modern Concept for both English and Chinese parts with a
+            # single _CONCEPT_RE pass instead of separate prefix/paren scans
             english_part_from_concept = None
             chinese_part_from_concept = None
 
             if modern_concept:
-                # Try to extract Chinese character(s) at the beginning of the string
-                initial_chinese_match = re.match(rf"({CHINESE_CHAR_REGEX}+)\s*(?:\([^)]+\))?", modern_concept)
-                if initial_chinese_match:
-                    chinese_part_from_concept = initial_chinese_match.group(1).strip()
-
-                # Try to extract content inside parentheses for English part
-                paren_content_match = re.search(r'\(([^)]+)\)', modern_concept)
-                if paren_content_match:
-                    english_part_from_concept = paren_content_match.group(1).strip()
-                else: # If no parentheses, use the whole modern_concept if it doesn't start with Chinese
-                    if not initial_chinese_match: # Only take whole string if no Chinese prefix
-                        english_part_from_concept = modern_concept.strip()
-                    else: # If there was a Chinese prefix, take anything after it as English
-                        remaining_part = modern_concept[len(initial_chinese_match.group(0)):].strip()
-                        if remaining_part and not re.match(rf"^{CHINESE_CHAR_REGEX}", remaining_part):
-                            english_part_from_concept = remaining_part
+                concept_match = _CONCEPT_RE.match(modern_concept)
+                chinese_part_from_concept = concept_match.group(1)
+                if chinese_part_from_concept is not None:
+                    chinese_part_from_concept = sys.intern(chinese_part_from_concept)
+
+                paren_part = concept_match.group(3)
+                if paren_part is not None:
+                    # Content of the first parenthesized chunk is the English part
+                    english_part_from_concept = paren_part.strip()
+                elif chinese_part_from_concept is None:
+                    # No parentheses and no Chinese prefix: whole concept is English
+                    english_part_from_concept = modern_concept.strip()
+                else:
+                    # No parentheses after a Chinese prefix: whatever follows is
+                    # English, unless it is just more (space-separated) Chinese
+                    remaining_part = modern_concept[concept_match.end(1):].strip()
+                    if remaining_part and not ('一' <= remaining_part[0] <= '鿿'):
+                        english_part_from_concept = remaining_part
+
+            parsed.append((tangut_char_for_map, phonetics_for_map,
+                           english_part_from_concept, chinese_part_from_concept,
+                           literal_tangut_meaning))
+        return parsed
+
+    @cached_property
+    def _tangut_maps(self):
+        """One entry pass building (char_data, tangut_to_chinese, chinese_to_tangut)."""
+        # {Tangut_char/compound_string: {'phonetics': '...', 'meanings': [...]}}
+        tangut_phrases_to_meanings = {}
+
+        # {Tangut_char/compound_string: 'Chinese_char', ...} (for all direct Tangut->Chinese mappings)
+        tangut_to_chinese = {}
+
+        # {Chinese_char: [Tangut_char1, Tangut_char2], ...} (for all Chinese->Tangut mappings)
+        # Built as sets so duplicate mappings are dropped on insert; converted to
+        # sorted lists once loading is done.
+        chinese_to_tangut = defaultdict(set)
+
+        total_entries_with_missing_phonetics = 0
+
+        for entry in self._li_fanwen_entries:
+            char = _clean(entry.get("Character", ""))
+            meaning_phrase = _clean(entry.get("Meaning", ""))
+            keyword_phrase = _clean(entry.get("Keyword", ""))
+            phonetics = _clean(entry.get("Phonetics", ""))
+            chinese_char = _clean(entry.get("Chinese Character", ""))
+
+            if not char:
+                continue
 
+            phonetics_to_store = phonetics
+            if not phonetics:
+                total_entries_with_missing_phonetics += 1
+                phonetics_to_store = "<?MISSING_PHONETICS?>"
+
+            # Intern heavily repeated strings so identical values share a
+            # single object across the thousands of index entries they appear in.
+            char = sys.intern(char)
+            phonetics_to_store = sys.intern(phonetics_to_store)
+            if meaning_phrase:
+                meaning_phrase = sys.intern(meaning_phrase)
+            if chinese_char:
+                chinese_char = sys.intern(chinese_char)
+
+            # An insertion-ordered dict-of-None dedups and keeps order in
+            # one structure; materialize to a list for storage
+            meanings = {}
+            if meaning_phrase and meaning_phrase != '?':
+                meanings[meaning_phrase] = None
+            if keyword_phrase and keyword_phrase != '?':
+                meanings[keyword_phrase] = None
+            tangut_phrases_to_meanings[char] = {
+                'phonetics': phonetics_to_store,
+                'meanings': list(meanings)
+            }
+
+            # Populate Chinese mappings (Tangut <-> Chinese, for single characters)
+            if chinese_char:
+                tangut_to_chinese[char] = chinese_char
+                chinese_to_tangut[chinese_char].add(char)
+
+        for (tangut_char_for_map, phonetics_for_map, english_part_from_concept,
+                chinese_part_from_concept, literal_tangut_meaning) in self._parsed_compounds:
             # Populate tangut_phrases_to_meanings with compound data
-            compound_meanings_list = []
+            compound_meanings = {}
             if literal_tangut_meaning and literal_tangut_meaning != '?':
-                compound_meanings_list.append(literal_tangut_meaning)
+                compound_meanings[literal_tangut_meaning] = None
             if english_part_from_concept and english_part_from_concept != '?':
-                if english_part_from_concept not in compound_meanings_list:
-                    compound_meanings_list.append(english_part_from_concept)
+                compound_meanings[english_part_from_concept] = None
 
             # Add/update the compound entry
             tangut_phrases_to_meanings[tangut_char_for_map] = {
                 'phonetics': phonetics_for_map,
-                'meanings': compound_meanings_list
+                'meanings': list(compound_meanings)
             }
 
-            # Add to english_to_tangut
-            if english_part_from_concept:
-                add_to_english_map(english_part_from_concept, tangut_char_for_map, phonetics_for_map, literal_tangut_meaning)
-            if literal_tangut_meaning and literal_tangut_meaning != '?':
-                add_to_english_map(literal_tangut_meaning, tangut_char_for_map, phonetics_for_map, literal_tangut_meaning)
-
             # Add to chinese_to_tangut if a Chinese character was extracted
             if chinese_part_from_concept:
                 # Store the mapping from the Chinese char to the compound Tangut word
-                chinese_to_tangut.setdefault(chinese_part_from_concept, []).append(tangut_char_for_map)
+                chinese_to_tangut[chinese_part_from_concept].add(tangut_char_for_map)
                 # Also add the reverse mapping for Tangut compound to Chinese
                 tangut_to_chinese[tangut_char_for_map] = chinese_part_from_concept
 
+        # Back to a plain dict of sorted lists so lookups of unknown keys
+        # downstream can't silently create empty entries.
+        chinese_to_tangut = {key: sorted(chars) for key, chars in chinese_to_tangut.items()}
+
+        if total_entries_with_missing_phonetics > 0:
+            print(f"Note: {total_entries_with_missing_phonetics} Li Fanwen entries had missing phonetics.")
+
+        result = (tangut_phrases_to_meanings, tangut_to_chinese, chinese_to_tangut)
+        self._write_cache_if_complete(tangut_maps=result)
+        return result
+
+    @cached_property
+    def _english_index(self):
+        """Second entry pass building (eng_to_tangut, eng_trie)."""
+        # {english_word_lower: [Posting(char='𘞗', phonetics='sjwɨ1', original_meaning='seed')], ...}
+        # defaultdicts avoid the double probe of setdefault on the hot insert
+        # path; they are converted back to plain dicts once loading is done.
+        english_to_tangut = defaultdict(list)
+
+        # Per-key sets of Posting records so duplicate entries are rejected at
+        # insert time instead of in a post-load pass.
+        english_seen = defaultdict(set)
+
+        # Helper function to add mappings to english_to_tangut
+        def add_to_english_map(key_phrase, tangut_char_display, phonetics_info, original_meaning_for_context):
+            if not key_phrase: return
+
+            # Normalize the phrase: remove punctuation, lowercase
+            normalized_key_phrase = _normalize(key_phrase)
+            if not normalized_key_phrase: return
+            # Interned keys hash/compare by pointer on later lookups and dedup
+            # repeated key storage across the index
+            normalized_key_phrase = sys.intern(normalized_key_phrase)
+
+            # char can be a single character or a compound string
+            entry = Posting(tangut_char_display, phonetics_info, original_meaning_for_context)
+
+            # Add the full normalized phrase as a lookup key
+            seen = english_seen[normalized_key_phrase]
+            if entry not in seen:
+                seen.add(entry)
+                english_to_tangut[normalized_key_phrase].append(entry)
+
+            # Add individual words from the phrase as lookup keys; for single-word
+            # phrases the word key equals the phrase key just inserted, so skip it
+            for word in normalized_key_phrase.split():
+                if word and word != normalized_key_phrase:
+                    word = sys.intern(word)
+                    seen = english_seen[word]
+                    if entry not in seen:
+                        seen.add(entry)
+                        english_to_tangut[word].append(entry)
+
+        for entry in self._li_fanwen_entries:
+            char = _clean(entry.get("Character", ""))
+            meaning_phrase = _clean(entry.get("Meaning", ""))
+            keyword_phrase = _clean(entry.get("Keyword", ""))
+            phonetics = _clean(entry.get("Phonetics", ""))
 
-    # --- Deduplicate results for english_to_tangut and chinese_to_tangut ---
-    # For English -> Tangut
-    for key in english_to_tangut:
-        seen_entries_for_key = set()
-        unique_entries_for_key = []
-        for entry in english_to_tangut[key]:
-            entry_tuple = tuple(sorted(entry.items()))
-            if entry_tuple not in seen_entries_for_key:
-                seen_entries_for_key.add(entry_tuple)
-                unique_entries_for_key.append(entry)
-        english_to_tangut[key] = unique_entries_for_key
+            if not char:
+                continue
 
-    # For Chinese -> Tangut, ensure unique Tangut chars as a sorted list
-    for key in chinese_to_tangut:
-        chinese_to_tangut[key] = sorted(list(set(chinese_to_tangut[key])))
+            char = sys.intern(char)
+            phonetics_to_store = sys.intern(phonetics) if phonetics else "<?MISSING_PHONETICS?>"
+            if meaning_phrase:
+                meaning_phrase = sys.intern(meaning_phrase)
+
+            # Populate english_to_tangut from Li Fanwen meanings. The
+            # Keyword field very often duplicates Meaning (modulo
+            # punctuation/case), in which case indexing it again would
+            # redo identical normalization and insertion work.
+            norm_meaning = None
+            if meaning_phrase and meaning_phrase != '?':
+                norm_meaning = _normalize(meaning_phrase)
+                add_to_english_map(meaning_phrase, char, phonetics_to_store, meaning_phrase)
+            if (keyword_phrase and keyword_phrase != '?'
+                    and keyword_phrase != meaning_phrase
+                    and _normalize(keyword_phrase) != norm_meaning):
+                add_to_english_map(keyword_phrase, char, phonetics_to_store, meaning_phrase if meaning_phrase else keyword_phrase)
+
+        for (tangut_char_for_map, phonetics_for_map, english_part_from_concept,
+                _chinese_part, literal_tangut_meaning) in self._parsed_compounds:
+            if english_part_from_concept:
+                add_to_english_map(english_part_from_concept, tangut_char_for_map, phonetics_for_map, literal_tangut_meaning)
+            if literal_tangut_meaning and literal_tangut_meaning != '?':
+                add_to_english_map(literal_tangut_meaning, tangut_char_for_map, phonetics_for_map, literal_tangut_meaning)
 
-    print(f"\nSummary: Loaded {total_li_fanwen_entries} Li Fanwen entries and {total_compound_entries} Proposed/Compound entries.")
-    if total_entries_with_missing_phonetics > 0:
-        print(f"Note: {total_entries_with_missing_phonetics} Li Fanwen entries had missing phonetics.")
+        # Back to a plain dict so lookups of unknown keys downstream can't
+        # silently create empty entries.
+        english_to_tangut = dict(english_to_tangut)
+
+        # Posting lists never change after load, so sort them once here instead
+        # of re-sorting on every translate_english_to_tangut lookup
+        for postings in english_to_tangut.values():
+            postings.sort(key=lambda p: (p.char, p.phonetics))
+
+        # --- Build a token-level trie over english_to_tangut keys ---
+        # Nodes are nested dicts keyed by word; the '$' key marks a complete
+        # phrase and holds its posting list. This lets the translator greedily
+        # match the longest known phrase starting at each position of the input
+        # instead of only translating word-by-word. The trie is then compacted
+        # into a radix tree so unary chains don't cost one dict per token.
+        english_trie = {}
+        for phrase, postings in english_to_tangut.items():
+            node = english_trie
+            for token in phrase.split():
+                node = node.setdefault(token, {})
+            existing = node.get('$')
+            if existing is None:
+                node['$'] = postings
+            else:
+                # Distinct dict keys can collapse to the same token path
+                # (split() folds runs of whitespace), so merge their posting
+                # lists rather than letting the last key win. A fresh list
+                # keeps the per-key lists in english_to_tangut untouched.
+                merged_seen = set(existing)
+                merged = existing + [p for p in postings if p not in merged_seen]
+                merged.sort(key=lambda p: (p.char, p.phonetics))
+                node['$'] = merged
+        english_trie = _compact_trie(english_trie)
+
+        result = (english_to_tangut, english_trie)
+        self._write_cache_if_complete(english_index=result)
+        return result
+
+    @cached_property
+    def char_data(self):
+        """Tangut char/compound -> {'phonetics', 'meanings'}."""
+        return self._tangut_maps[0]
+
+    @cached_property
+    def tangut_to_chinese(self):
+        return self._tangut_maps[1]
+
+    @cached_property
+    def chinese_to_tangut(self):
+        return self._tangut_maps[2]
+
+    @cached_property
+    def eng_to_tangut(self):
+        """English key -> sorted [Posting, ...]."""
+        return self._english_index[0]
+
+    @cached_property
+    def eng_trie(self):
+        """Radix tree over eng_to_tangut keys."""
+        return self._english_index[1]
+
+    @cached_property
+    def char_automaton(self):
+        """Aho-Corasick automaton over char_data keys, or None without pyahocorasick."""
+        return _build_automaton(self.char_data)
+
+    @cached_property
+    def t2c_automaton(self):
+        """Aho-Corasick automaton over tangut_to_chinese keys, or None without pyahocorasick."""
+        return _build_automaton(self.tangut_to_chinese)
+
+    @cached_property
+    def char_lengths(self):
+        """First char -> descending distinct char_data key lengths."""
+        return _first_char_lengths(self.char_data)
+
+    @cached_property
+    def t2c_lengths(self):
+        """First char -> descending distinct tangut_to_chinese key lengths."""
+        return _first_char_lengths(self.tangut_to_chinese)
+
+    @cached_property
+    def char_scan_re(self):
+        """One-pass alternation regex over char_data keys."""
+        return _build_scan_regex(self.char_data)
+
+    @cached_property
+    def t2c_scan_re(self):
+        """One-pass alternation regex over tangut_to_chinese keys."""
+        return _build_scan_regex(self.tangut_to_chinese)
+
+    @cached_property
+    def char_table(self):
+        """Codepoint-indexed single-character data.
+
+        Single characters all live in the fixed Tangut Unicode block, so their
+        data can sit in a list indexed by codepoint offset; list indexing avoids
+        hashing a one-character string for every character of input.
+        """
+        table = [_MISS] * _TANGUT_BLOCK_SIZE
+        for key, data in self.char_data.items():
+            if len(key) == 1:
+                offset = ord(key) - _TANGUT_BASE
+                if 0 <= offset < _TANGUT_BLOCK_SIZE:
+                    table[offset] = data
+        return table
+
+    @cached_property
+    def t2c_char_table(self):
+        """Codepoint-indexed single-character Tangut->Chinese equivalents;
+        compounds keep going through the dict in the longest-match scan."""
+        table = [_MISS] * _TANGUT_BLOCK_SIZE
+        for key, chinese in self.tangut_to_chinese.items():
+            if len(key) == 1:
+                offset = ord(key) - _TANGUT_BASE
+                if 0 <= offset < _TANGUT_BLOCK_SIZE:
+                    table[offset] = chinese
+        return table
 
-    # Return None for dictionaries if any essential data failed to load
-    if li_fanwen_data is None or compound_data is None:
-        return None, None, None, None
 
-    return tangut_phrases_to_meanings, english_to_tangut, tangut_to_chinese, chinese_to_tangut
+def load_tangut_data(lifanwen_file_path, compound_file_path):
+    """
+    Loads the raw Tangut vocabulary entries from the two JSON files and returns
+    them as a TangutData bundle, or None if an essential file failed to load.
+    The translation dictionaries themselves are built lazily, on first access
+    of each direction's attributes.
+
+    Built dictionaries are cached to a pickle beside the JSON, keyed on the
+    (mtime, size) of both source files; the cache is reused on later runs as
+    long as that signature still matches.
+    """
+    cache_path = lifanwen_file_path + '.pkl'
+    try:
+        source_sig = (os.path.getmtime(lifanwen_file_path), os.path.getsize(lifanwen_file_path),
+                      os.path.getmtime(compound_file_path), os.path.getsize(compound_file_path))
+    except OSError:
+        source_sig = None  # missing source file; the normal load path reports it
+
+    if source_sig is not None and os.path.exists(cache_path):
+        try:
+            with open(cache_path, 'rb') as f:
+                cached_sig, snapshot = pickle.load(f)
+            if cached_sig == source_sig:
+                print(f"\nLoaded translation data from cache '{cache_path}'.")
+                return TangutData.from_cache(snapshot)
+        except Exception as e:
+            print(f"Note: could not read cache '{cache_path}' ({e}); rebuilding from JSON.")
+
+    # A prebuilt merged data file (see build_data.py) supplies both entry
+    # lists in a single open/parse pass when one is present and fresh
+    merged = _load_merged_entries(lifanwen_file_path, compound_file_path)
+    if merged is not None:
+        li_fanwen_entries, compound_entries = merged
+    else:
+        # The two source files are independent, so open and parse them on two
+        # threads; file I/O (and orjson parsing) releases the GIL, letting the
+        # loads overlap instead of running back to back. Submitting the eager
+        # loader keeps materialization on the workers too — with ijson the
+        # plain load_json_data call returns a lazy generator immediately and
+        # all parsing would otherwise run serially back on this thread.
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            li_future = pool.submit(_load_json_entries, lifanwen_file_path)
+            compound_future = pool.submit(_load_json_entries, compound_file_path)
+            li_fanwen_entries = li_future.result()
+            compound_entries = compound_future.result()
+
+        if li_fanwen_entries is None or compound_entries is None:
+            return None
+
+    print(f"\nSummary: Loaded {len(li_fanwen_entries)} Li Fanwen entries and {len(compound_entries)} Proposed/Compound entries.")
+
+    return TangutData(li_fanwen_entries, compound_entries, cache_path, source_sig)
 
 # The translation functions now take tangut_phrases_to_meanings as the primary source for Tangut->X lookups
-def translate_tangut_to_english(tangut_text, tangut_phrases_to_meanings):
+def translate_tangut_to_english(tangut_text: str, tangut_phrases_to_meanings: dict,
+                                char_table: list | None = None, lengths: dict | None = None,
+                                automaton=None, scan_re: re.Pattern | None = None) -> str:
     """
     Translates a Tangut text (string of characters/compounds) to English,
-    prioritizing longer compound word matches.
+    prioritizing longer compound word matches. An optional codepoint-indexed
+    char_table serves single-character lookups without dict hashing, and an
+    optional first-char lengths table restricts the longest-match scan to
+    key lengths that can actually match at each position. When an
+    Aho-Corasick automaton or a longest-first alternation regex over the
+    same keys is supplied, it replaces the Python scan entirely with one
+    linear C-level pass.
     """
     if not tangut_phrases_to_meanings:
         return "Translation service not available (data not loaded)."
 
-    detailed_results = []
-    combined_meanings_set = set()
+    # One growing StringIO buffer instead of a list of per-segment strings;
+    # for long texts the list-append + join pattern allocates one short
+    # string object per character, which the C-level buffer avoids.
+    buf = io.StringIO()
+    buf.write("--- Word-by-Word Translation (Tangut -> English) ---\n")
+    # Dict-of-None keeps first-appearance order and is cheaper than a set
+    # plus a final sort for the short inputs typical here
+    combined_meanings = {}
     combined_phonetics_list = []
-
-    # Pre-calculate max length of Tangut keys for efficient lookup
-    max_key_length = max(len(k) for k in tangut_phrases_to_meanings.keys()) if tangut_phrases_to_meanings else 1
-
-    idx = 0
-    while idx < len(tangut_text):
-        found_match = False
-        # Try to find the longest possible match starting from current index
-        # Iterate from max_key_length down to 1
-        for length in range(min(max_key_length, len(tangut_text) - idx), 0, -1):
-            segment = tangut_text[idx : idx + length]
-            segment_data = tangut_phrases_to_meanings.get(segment)
-
-            if segment_data:
-                # Found a match (can be single char or compound)
+    fmt_cache = {}  # formatted line per segment; characters often repeat in text
+
+    # Bound methods as locals: each use in the loop below is then a single
+    # LOAD_FAST instead of an attribute lookup per iteration
+    write = buf.write
+    cp_append = combined_phonetics_list.append
+    pget = tangut_phrases_to_meanings.get
+
+    # Pre-calculate max length of Tangut keys for efficient lookup (only
+    # needed by the fallback scan with no per-first-char lengths table)
+    if lengths is None and automaton is None and scan_re is None:
+        max_key_length = max(len(k) for k in tangut_phrases_to_meanings.keys()) if tangut_phrases_to_meanings else 1
+
+    n = len(tangut_text)
+    if automaton is not None:
+        # One linear automaton pass: iter_long yields leftmost-longest
+        # matches with their end offsets; every character in the gaps
+        # between matches is unknown.
+        pos = 0
+        for end_idx, (segment, segment_data) in automaton.iter_long(tangut_text):
+            for unknown_idx in range(pos, end_idx - len(segment) + 1):
+                write("'" + tangut_text[unknown_idx] + "': UNKNOWN CHARACTER\n")
+                cp_append("<?>")
+            meanings = segment_data.get('meanings', [])
+            phonetics = segment_data.get('phonetics', '<?PHONETICS_N/A?>')
+            line = fmt_cache.get(segment)
+            if line is None:
+                line = ("'" + segment + "' (" + phonetics + "): "
+                            + (', '.join(meanings) if meanings else 'No meaning found') + "\n")
+                fmt_cache[segment] = line
+            write(line)
+            for meaning in meanings:
+                combined_meanings[meaning] = None
+            cp_append(phonetics)
+            pos = end_idx + 1
+        for unknown_idx in range(pos, n):
+            write("'" + tangut_text[unknown_idx] + "': UNKNOWN CHARACTER\n")
+            cp_append("<?>")
+    elif scan_re is not None:
+        # One finditer pass: each match is either the longest key starting
+        # at that position or, via the trailing '.' arm, one unknown character
+        for scan_match in scan_re.finditer(tangut_text):
+            segment = scan_match.group()
+            segment_data = pget(segment, _MISS)
+            if segment_data is not _MISS:
                 meanings = segment_data.get('meanings', [])
                 phonetics = segment_data.get('phonetics', '<?PHONETICS_N/A?>')
-                detailed_results.append(f"'{segment}' ({phonetics}): {', '.join(meanings) if meanings else 'No meaning found'}")
-                combined_meanings_set.update(meanings)
-                combined_phonetics_list.append(phonetics)
-                idx += length # Advance index by the length of the matched segment
-                found_match = True
-                break # Move to the next segment after this match
-
-        if not found_match:
-            # No match found for any length, treat as unknown
-            char = tangut_text[idx] # This is the character that couldn't be matched
-            detailed_results.append(f"'{char}': UNKNOWN CHARACTER")
-            combined_phonetics_list.append("<?>")
-            idx += 1 # Advance by 1 character
-
-    output = []
-    output.append("--- Word-by-Word Translation (Tangut -> English) ---")
-    output.extend(detailed_results)
-    output.append("---------------------------------------------------\n")
-
-    output.append("--- Combined Phrase Details ---")
-    output.append(f"Combined Meanings: {', '.join(sorted(list(combined_meanings_set)))}")
-    output.append(f"Combined Pronunciation: {' '.join(combined_phonetics_list)}")
-    output.append("-------------------------------\n")
-
-    return "\n".join(output)
-
-def translate_english_to_tangut(english_text, e_to_t_dict):
+                line = fmt_cache.get(segment)
+                if line is None:
+                    line = ("'" + segment + "' (" + phonetics + "): "
+                            + (', '.join(meanings) if meanings else 'No meaning found') + "\n")
+                    fmt_cache[segment] = line
+                write(line)
+                for meaning in meanings:
+                    combined_meanings[meaning] = None
+                cp_append(phonetics)
+            else:
+                write("'" + segment + "': UNKNOWN CHARACTER\n")
+                cp_append("<?>")
+    else:
+        idx = 0
+        while idx < n:
+            found_match = False
+            # Try to find the longest possible match starting from current index;
+            # with a lengths table only lengths of keys sharing this first
+            # character are probed, otherwise iterate from max_key_length down to 1
+            if lengths is not None:
+                candidate_lengths = lengths.get(tangut_text[idx], ())
+            else:
+                candidate_lengths = range(min(max_key_length, n - idx), 0, -1)
+            for length in candidate_lengths:
+                if length > n - idx:
+                    continue
+                segment = tangut_text[idx : idx + length]
+                if length == 1 and char_table is not None:
+                    offset = ord(segment) - _TANGUT_BASE
+                    if 0 <= offset < _TANGUT_BLOCK_SIZE:
+                        segment_data = char_table[offset]
+                    else:
+                        # Out-of-block single characters are not in the table;
+                        # probe the dict like any other segment
+                        segment_data = pget(segment, _MISS)
+                else:
+                    segment_data = pget(segment, _MISS)
+
+                if segment_data is not _MISS:
+                    # Found a match (can be single char or compound)
+                    meanings = segment_data.get('meanings', [])
+                    phonetics = segment_data.get('phonetics', '<?PHONETICS_N/A?>')
+                    line = fmt_cache.get(segment)
+                    if line is None:
+                        line = ("'" + segment + "' (" + phonetics + "): "
+                            + (', '.join(meanings) if meanings else 'No meaning found') + "\n")
+                        fmt_cache[segment] = line
+                    write(line)
+                    for meaning in meanings:
+                        combined_meanings[meaning] = None
+                    cp_append(phonetics)
+                    idx += length # Advance index by the length of the matched segment
+                    found_match = True
+                    break # Move to the next segment after this match
+
+            if not found_match:
+                # No match found for any length, treat as unknown
+                char = tangut_text[idx] # This is the character that couldn't be matched
+                write("'" + char + "': UNKNOWN CHARACTER\n")
+                cp_append("<?>")
+                idx += 1 # Advance by 1 character
+
+    buf.write("---------------------------------------------------\n\n")
+
+    buf.write("--- Combined Phrase Details ---\n")
+    buf.write(f"Combined Meanings: {', '.join(combined_meanings)}\n")
+    buf.write(f"Combined Pronunciation: {' '.join(combined_phonetics_list)}\n")
+    buf.write("-------------------------------\n")
+
+    return buf.getvalue()
+
+def translate_english_to_tangut(english_text: str, e_to_t_dict: dict, e_to_t_trie: dict | None = None) -> str:
     """
-    Translates an English text to Tangut word-by-word and provides combined phrases.
+    Translates an English text to Tangut and provides combined phrases.
+    When a phrase trie is supplied, greedily matches the longest known
+    phrase starting at each position; otherwise translates word-by-word.
     Lists multiple Tangut options if available.
     """
     if not e_to_t_dict:
         return "Translation service not available (data not loaded)."
 
-    normalized_text = re.sub(r'[^\w\s]', '', english_text).lower()
+    normalized_text = _normalize(english_text)
     words = normalized_text.split()
 
     detailed_results = []
     combined_tangut_chars_list = []
     combined_phonetics_list = []
 
-    for word in words:
-        matches = e_to_t_dict.get(word)
-        if matches:
-            sorted_matches = sorted(matches, key=lambda x: (x['char'], x['phonetics']))
+    # Bound methods as locals: each use in the loop below is then a single
+    # LOAD_FAST instead of an attribute lookup per iteration
+    get = e_to_t_dict.get
+    dr_append = detailed_results.append
+    ct_append = combined_tangut_chars_list.append
+    cp_append = combined_phonetics_list.append
 
+    idx = 0
+    while idx < len(words):
+        matches = None
+        matched_length = 1
+        if e_to_t_trie is not None:
+            # Walk the radix tree from this position, remembering the longest
+            # phrase that ends on a '$' terminal. Each edge carries a tuple
+            # of tokens that must all match for the descent to continue.
+            node = e_to_t_trie
+            j = idx
+            while j < len(words):
+                edge = node.get(words[j])
+                if edge is None:
+                    break
+                label, child = edge
+                if tuple(words[j : j + len(label)]) != label:
+                    break
+                j += len(label)
+                node = child
+                if '$' in node:
+                    matches = node['$']
+                    matched_length = j - idx
+        else:
+            matches = get(words[idx])
+
+        matched_key = ' '.join(words[idx : idx + matched_length])
+        if matches:
+            # Posting lists are pre-sorted by (char, phonetics) at load time
             option_strings = []
-            for match_info in sorted_matches:
-                option_strings.append(f"'{match_info['char']}' ({match_info['phonetics']}) [from: '{match_info['original_meaning']}']")
+            for match_info in matches:
+                option_strings.append(f"'{match_info.char}' ({match_info.phonetics}) [from: '{match_info.original_meaning}']")
 
-            detailed_results.append(f"'{word}': {'; '.join(option_strings)}")
+            dr_append(f"'{matched_key}': {'; '.join(option_strings)}")
 
             # For combined phrase, pick the first match for simplicity
-            first_match = sorted_matches[0]
-            combined_tangut_chars_list.append(first_match['char'])
-            combined_phonetics_list.append(first_match['phonetics'])
+            first_match = matches[0]
+            ct_append(first_match.char)
+            cp_append(first_match.phonetics)
         else:
-            detailed_results.append(f"'{word}': UNKNOWN WORD")
-            combined_tangut_chars_list.append("<?>")
-            combined_phonetics_list.append("<?ph?>")
+            dr_append(f"'{matched_key}': UNKNOWN WORD")
+            ct_append("<?>")
+            cp_append("<?ph?>")
+        idx += matched_length
 
     output = []
     output.append("--- Word-by-Word Translation (English -> Tangut) ---")
@@ -309,92 +962,210 @@ def translate_english_to_tangut(english_text, e_to_t_dict):
 
     return "\n".join(output)
 
-def translate_tangut_to_chinese(tangut_text, t_to_c_dict):
+def batch_translate_english_to_tangut(texts, e_to_t_dict: dict) -> Iterator[str]:
     """
-    Translates a Tangut text (string of characters/compounds) to Chinese,
-    prioritizing longer compound word matches.
+    Translates an iterable of English texts to Tangut word-by-word, yielding
+    one formatted result per input. Intended for offline bulk translation:
+    invariant work (normalization regex, dict lookups, list buffers) is bound
+    once outside the per-text loop, and results are yielded lazily so the
+    whole output never has to sit in memory at once.
     """
-    if not t_to_c_dict:
-        return "Translation service not available (Chinese data not loaded)."
+    if not e_to_t_dict:
+        return
+
+    normalize = _normalize
+    get = e_to_t_dict.get
+    combined_tangut_chars_list = []
+    combined_phonetics_list = []
+
+    for english_text in texts:
+        combined_tangut_chars_list.clear()
+        combined_phonetics_list.clear()
+        detailed_results = []
+
+        for word in normalize(english_text).split():
+            matches = get(word)
+            if matches:
+                # Posting lists are pre-sorted by (char, phonetics) at load time
+                option_strings = [f"'{m.char}' ({m.phonetics}) [from: '{m.original_meaning}']" for m in matches]
+                detailed_results.append(f"'{word}': {'; '.join(option_strings)}")
+                first_match = matches[0]
+                combined_tangut_chars_list.append(first_match.char)
+                combined_phonetics_list.append(first_match.phonetics)
+            else:
+                detailed_results.append(f"'{word}': UNKNOWN WORD")
+                combined_tangut_chars_list.append("<?>")
+                combined_phonetics_list.append("<?ph?>")
+
+        output = []
+        output.append("--- Word-by-Word Translation (English -> Tangut) ---")
+        output.extend(detailed_results)
+        output.append("---------------------------------------------------\n")
+
+        output.append("--- Combined Phrase Details ---")
+        output.append(f"Combined Tangut Phrase: {''.join(combined_tangut_chars_list)}")
+        output.append(f"Combined Pronunciation: {' '.join(combined_phonetics_list)}")
+        output.append("-------------------------------\n")
+
+        yield "\n".join(output)
+
+def _tangut_to_chinese_lines(tangut_text: str, t_to_c_dict: dict, char_table: list | None,
+                             lengths: dict | None, automaton, scan_re: re.Pattern | None) -> Iterator[str]:
+    """
+    Yields the output lines of a Tangut->Chinese translation one at a time:
+    header, one detail line per matched segment or unknown character, then
+    the combined-phrase footer. The final "\n".join sizes the result buffer
+    once, with no intermediate detailed/output lists.
+    """
+    yield "--- Word-by-Word Translation (Tangut -> Chinese) ---"
 
-    detailed_results = []
     combined_chinese_chars = []
 
+    # Bound methods as locals: each use in the loop below is then a single
+    # LOAD_FAST instead of an attribute lookup per iteration
+    get = t_to_c_dict.get
+    cc_append = combined_chinese_chars.append
+
     # Use the same longest-match logic as Tangut->English
-    # Max length of a Tangut phrase that has a Chinese mapping
-    max_key_length = max(len(k) for k in t_to_c_dict.keys()) if t_to_c_dict else 1
+    # Max length of a Tangut phrase that has a Chinese mapping (only needed
+    # by the fallback scan with no per-first-char lengths table)
+    if lengths is None and automaton is None and scan_re is None:
+        max_key_length = max(len(k) for k in t_to_c_dict.keys()) if t_to_c_dict else 1
+
+    n = len(tangut_text)
+    if automaton is not None:
+        # One linear automaton pass: iter_long yields leftmost-longest
+        # matches with their end offsets; every character in the gaps
+        # between matches is unknown.
+        pos = 0
+        for end_idx, (segment, chinese_char) in automaton.iter_long(tangut_text):
+            for unknown_idx in range(pos, end_idx - len(segment) + 1):
+                yield f"'{tangut_text[unknown_idx]}': UNKNOWN OR NO CHINESE EQUIVALENT"
+                cc_append("<?>")
+            yield f"'{segment}': '{chinese_char}'"
+            cc_append(chinese_char)
+            pos = end_idx + 1
+        for unknown_idx in range(pos, n):
+            yield f"'{tangut_text[unknown_idx]}': UNKNOWN OR NO CHINESE EQUIVALENT"
+            cc_append("<?>")
+    elif scan_re is not None:
+        # One finditer pass: each match is either the longest key starting
+        # at that position or, via the trailing '.' arm, one unknown character
+        for scan_match in scan_re.finditer(tangut_text):
+            segment = scan_match.group()
+            chinese_char = get(segment, _MISS)
+            if chinese_char is not _MISS:
+                yield f"'{segment}': '{chinese_char}'"
+                cc_append(chinese_char)
+            else:
+                yield f"'{segment}': UNKNOWN OR NO CHINESE EQUIVALENT"
+                cc_append("<?>")
+    else:
+        idx = 0
+        while idx < n:
+            found_match = False
+            if lengths is not None:
+                candidate_lengths = lengths.get(tangut_text[idx], ())
+            else:
+                candidate_lengths = range(min(max_key_length, n - idx), 0, -1)
+            for length in candidate_lengths:
+                if length > n - idx:
+                    continue
+                segment = tangut_text[idx : idx + length]
+                if length == 1 and char_table is not None:
+                    offset = ord(segment) - _TANGUT_BASE
+                    if 0 <= offset < _TANGUT_BLOCK_SIZE:
+                        chinese_char = char_table[offset]
+                    else:
+                        chinese_char = get(segment, _MISS)
+                else:
+                    chinese_char = get(segment, _MISS)
+
+                if chinese_char is not _MISS:
+                    yield f"'{segment}': '{chinese_char}'"
+                    cc_append(chinese_char)
+                    idx += length
+                    found_match = True
+                    break
 
-    idx = 0
-    while idx < len(tangut_text):
-        found_match = False
-        for length in range(min(max_key_length, len(tangut_text) - idx), 0, -1):
-            segment = tangut_text[idx : idx + length]
-            chinese_char = t_to_c_dict.get(segment)
+            if not found_match:
+                char = tangut_text[idx]
+                yield f"'{char}': UNKNOWN OR NO CHINESE EQUIVALENT"
+                cc_append("<?>")
+                idx += 1
 
-            if chinese_char:
-                detailed_results.append(f"'{segment}': '{chinese_char}'")
-                combined_chinese_chars.append(chinese_char)
-                idx += length
-                found_match = True
-                break
-
-        if not found_match:
-            char = tangut_text[idx]
-            detailed_results.append(f"'{char}': UNKNOWN OR NO CHINESE EQUIVALENT")
-            combined_chinese_chars.append("<?>")
-            idx += 1
+    yield "---------------------------------------------------\n"
 
-    output = []
-    output.append("--- Word-by-Word Translation (Tangut -> Chinese) ---")
-    output.extend(detailed_results)
-    output.append("---------------------------------------------------\n")
+    yield "--- Combined Phrase Details ---"
+    yield f"Combined Chinese Phrase: {''.join(combined_chinese_chars)}"
+    yield "-------------------------------\n"
 
-    output.append("--- Combined Phrase Details ---")
-    output.append(f"Combined Chinese Phrase: {''.join(combined_chinese_chars)}")
-    output.append("-------------------------------\n")
+def translate_tangut_to_chinese(tangut_text: str, t_to_c_dict: dict,
+                                char_table: list | None = None, lengths: dict | None = None,
+                                automaton=None, scan_re: re.Pattern | None = None) -> str:
+    """
+    Translates a Tangut text (string of characters/compounds) to Chinese,
+    prioritizing longer compound word matches. An optional codepoint-indexed
+    char_table serves single-character lookups without dict hashing, and an
+    optional first-char lengths table restricts the longest-match scan to
+    key lengths that can actually match at each position. When an
+    Aho-Corasick automaton or a longest-first alternation regex over the
+    same keys is supplied, it replaces the Python scan entirely with one
+    linear C-level pass.
+    """
+    if not t_to_c_dict:
+        return "Translation service not available (Chinese data not loaded)."
 
-    return "\n".join(output)
+    return "\n".join(_tangut_to_chinese_lines(tangut_text, t_to_c_dict, char_table,
+                                              lengths, automaton, scan_re))
 
-def translate_chinese_to_tangut(chinese_text, c_to_t_dict):
+def _chinese_to_tangut_lines(chinese_text: str, c_to_t_dict: dict) -> Iterator[str]:
     """
-    Translates a Chinese text (string of characters) to Tangut.
-    Presents multiple Tangut options if available.
+    Yields the output lines of a Chinese->Tangut translation one at a time;
+    see _tangut_to_chinese_lines for the rationale.
     """
-    if not c_to_t_dict:
-        return "Translation service not available (Chinese data not loaded)."
+    yield "--- Word-by-Word Translation (Chinese -> Tangut) ---"
 
-    detailed_results = []
     combined_tangut_chars = []
 
+    # Bound methods as locals: each use in the loop below is then a single
+    # LOAD_FAST instead of an attribute lookup per iteration
+    get = c_to_t_dict.get
+    ct_append = combined_tangut_chars.append
+
     # Iterate over each Chinese character in the input string
     for char in chinese_text:
-        tangut_matches = c_to_t_dict.get(char)
-        if tangut_matches:
-            # Sort for consistent output
-            sorted_tangut_matches = sorted(tangut_matches)
-            
+        tangut_matches = get(char, _MISS)
+        if tangut_matches is not _MISS:
+            # Match lists are already sorted at load time, so the output
+            # stays deterministic without re-sorting per query.
             # 1. Create the string of joined matches first. This avoids complex syntax inside the f-string.
-            matches_str = '; '.join(f"'{t_char}'" for t_char in sorted_tangut_matches)
-            
-            # 2. Now, use the simple variable in the main f-string.
-            detailed_results.append(f"'{char}': {matches_str}")
-            
+            matches_str = '; '.join(f"'{t_char}'" for t_char in tangut_matches)
+
+            # 2. Now, yield the line using the simple variable.
+            yield "'" + char + "': " + matches_str
+
             # For combined phrase, pick the first match (alphabetically sorted)
-            combined_tangut_chars.append(sorted_tangut_matches[0])
+            ct_append(tangut_matches[0])
         else:
-            detailed_results.append(f"'{char}': UNKNOWN OR NO TANGUT EQUIVALENT")
-            combined_tangut_chars.append("<?>")
+            yield "'" + char + "': UNKNOWN OR NO TANGUT EQUIVALENT"
+            ct_append("<?>")
 
-    output = []
-    output.append("--- Word-by-Word Translation (Chinese -> Tangut) ---")
-    output.extend(detailed_results)
-    output.append("---------------------------------------------------\n")
+    yield "---------------------------------------------------\n"
 
-    output.append("--- Combined Phrase Details ---")
-    output.append(f"Combined Tangut Phrase: {''.join(combined_tangut_chars)}")
-    output.append("-------------------------------\n")
+    yield "--- Combined Phrase Details ---"
+    yield f"Combined Tangut Phrase: {''.join(combined_tangut_chars)}"
+    yield "-------------------------------\n"
 
-    return "\n".join(output)
+def translate_chinese_to_tangut(chinese_text: str, c_to_t_dict: dict) -> str:
+    """
+    Translates a Chinese text (string of characters) to Tangut.
+    Presents multiple Tangut options if available.
+    """
+    if not c_to_t_dict:
+        return "Translation service not available (Chinese data not loaded)."
+
+    return "\n".join(_chinese_to_tangut_lines(chinese_text, c_to_t_dict))
 
 def clear_screen():
     """Clears the terminal screen."""
@@ -406,10 +1177,9 @@ def main():
     compound_words_file = 'TangutCompoundWordsProposed.json'
 
     print("Loading Tangut data...")
-    tangut_phrases_to_meanings, english_to_tangut_dict, tangut_to_chinese_dict, chinese_to_tangut_dict = \
-        load_tangut_data(li_fanwen_file, compound_words_file)
+    data = load_tangut_data(li_fanwen_file, compound_words_file)
 
-    if tangut_phrases_to_meanings is None: # Check if essential data loaded
+    if data is None: # Check if essential data loaded
         print("Failed to load data. Exiting.")
         return
 
@@ -421,6 +1191,26 @@ def main():
     print("For English/Chinese to Tangut, it will list all possible matches for a given word/character.")
     print("---------------------\n")
 
+    # Dispatch table for the translation directions: each choice maps to
+    # (input prompt, empty-input message, translate callable). The four
+    # directions share one generic input loop below.
+    directions = {
+        '1': ("Enter Tangut characters (e.g., 𘞗𘟇𘞼 or 𗲠𘔺) (or '/exit' to go back): ",
+              "Please enter some Tangut characters.",
+              lambda text: translate_tangut_to_english(text, data.char_data, data.char_table,
+                                                       data.char_lengths, data.char_automaton)),
+        '2': ("Enter English text (e.g., sky river) (or '/exit' to go back): ",
+              "Please enter some English text.",
+              lambda text: translate_english_to_tangut(text, data.eng_to_tangut, data.eng_trie)),
+        '3': ("Enter Tangut characters (e.g., 𗥈𗡼 or 𗲠𘔺) (or '/exit' to go back): ",
+              "Please enter some Tangut characters.",
+              lambda text: translate_tangut_to_chinese(text, data.tangut_to_chinese, data.t2c_char_table,
+                                                       data.t2c_lengths, data.t2c_automaton)),
+        '4': ("Enter Chinese characters (e.g., 協助 or 氧) (or '/exit' to go back): ",
+              "Please enter some Chinese characters.",
+              lambda text: translate_chinese_to_tangut(text, data.chinese_to_tangut)),
+    }
+
     while True:
         print("Choose a translation direction:")
         print("1. Tangut -> English")
@@ -432,53 +1222,22 @@ def main():
         choice = input("Enter your choice (1/2/3/4/5/6): ").strip()
         print("-" * 60)
 
-        if choice == '1':
-            while True:
-                text_to_translate = input("Enter Tangut characters (e.g., 𘞗𘟇𘞼 or 𗲠𘔺) (or '/exit' to go back): ").strip()
-                if text_to_translate.lower() == '/exit':
-                    break
-                if not text_to_translate:
-                    print("Please enter some Tangut characters.")
-                    continue
-                # Pass tangut_phrases_to_meanings for the new longest-match logic
-                print(translate_tangut_to_english(text_to_translate, tangut_phrases_to_meanings))
-                print("=" * 60)
-        elif choice == '2':
-            while True:
-                text_to_translate = input("Enter English text (e.g., sky river) (or '/exit' to go back): ").strip()
-                if text_to_translate.lower() == '/exit':
-                    break
-                if not text_to_translate:
-                    print("Please enter some English text.")
-                    continue
-                print(translate_english_to_tangut(text_to_translate, english_to_tangut_dict))
-                print("=" * 60)
-        elif choice == '3':
-            while True:
-                text_to_translate = input("Enter Tangut characters (e.g., 𗥈𗡼 or 𗲠𘔺) (or '/exit' to go back): ").strip()
-                if text_to_translate.lower() == '/exit':
-                    break
-                if not text_to_translate:
-                    print("Please enter some Tangut characters.")
-                    continue
-                # Pass tangut_to_chinese_dict for the new longest-match logic for Chinese
-                print(translate_tangut_to_chinese(text_to_translate, tangut_to_chinese_dict))
-                print("=" * 60)
-        elif choice == '4':
+        if choice == '5':
+            print("Exiting translator...")
+            break
+        elif choice == '6':
+            clear_screen()
+        elif choice in directions:
+            prompt, empty_message, translate = directions[choice]
             while True:
-                text_to_translate = input("Enter Chinese characters (e.g., 協助 or 氧) (or '/exit' to go back): ").strip()
+                text_to_translate = input(prompt).strip()
                 if text_to_translate.lower() == '/exit':
                     break
                 if not text_to_translate:
-                    print("Please enter some Chinese characters.")
+                    print(empty_message)
                     continue
-                print(translate_chinese_to_tangut(text_to_translate, chinese_to_tangut_dict))
+                print(translate(text_to_translate))
                 print("=" * 60)
-        elif choice == '5':
-            print("Exiting translator...")
-            break
-        elif choice == '6':
-            clear_screen()
         else:
             print("Invalid choice. Please enter 1, 2, 3, 4, 5, or 6.")
         print("=" * 60) # Main menu separator